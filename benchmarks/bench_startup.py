@@ -0,0 +1,108 @@
+"""Startup benchmark of the vwkommi command line interface.
+
+Runs every command a couple of times in a fresh interpreter and reports the fastest run. Besides
+the help of the commands a prefix lookup answered by the prefix cache is measured. Exits with 1 if
+a command takes longer than the limit or if the dispatcher imports modules which are only needed
+by the sub commands.
+
+    python benchmarks/bench_startup.py [-r RUNS] [-l LIMIT]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = [
+    ("import vwkommi", ["-c", "import vwkommi"]),
+    ("vwkommi --help", ["-m", "vwkommi", "--help"]),
+    ("vwkommi request --help", ["-m", "vwkommi", "request", "--help"]),
+    ("vwkommi query --help", ["-m", "vwkommi", "query", "--help"]),
+]
+
+# commission number looked up from a prefilled prefix cache
+CACHED_COMMISSION_NUMBER = "AL1234"
+
+# modules which must not be imported before a sub command needs them
+LAZY_MODULES = ["requests", "concurrent.futures", "vwkommi.request.request"]
+
+
+def run_command(args: list) -> float:
+    """Returns the wall time of running the interpreter with _args_."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable] + args,
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - start
+
+
+def imported_modules(args: list) -> set:
+    """Returns the names of the modules imported when running the interpreter with _args_."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def main() -> int:
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description="VW Kommi startup benchmark")
+    parser.add_argument("-r", "--runs", dest="runs", type=int, default=10)
+    parser.add_argument(
+        "-l",
+        "--limit",
+        dest="limit",
+        type=float,
+        default=0.1,
+        help="Maximum startup time in seconds (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        with open(os.path.join(base_dir, "prefix_cache.json"), "w", encoding="utf-8") as file:
+            json.dump({CACHED_COMMISSION_NUMBER: [185, 2021]}, file)
+        commands = COMMANDS + [
+            (
+                "vwkommi request -f (cached)",
+                ["-m", "vwkommi", "request", "-b", base_dir, "-f", CACHED_COMMISSION_NUMBER],
+            )
+        ]
+        return 1 if run_benchmark(commands, args.runs, args.limit) else 0
+
+
+def run_benchmark(commands: list, runs: int, limit: float) -> bool:
+    """Prints the fastest run of every command and returns whether one of them failed."""
+    baseline = min(run_command(["-c", "pass"]) for _ in range(runs))
+    print(f"{'interpreter':<28}{baseline * 1000:8.1f} ms")
+    failed = False
+    for name, command in commands:
+        duration = min(run_command(command) for _ in range(runs))
+        status = "ok" if duration <= limit else "SLOW"
+        failed |= duration > limit
+        print(f"{name:<28}{duration * 1000:8.1f} ms  {status}")
+        eager = sorted(set(LAZY_MODULES) & imported_modules(command))
+        if eager:
+            failed = True
+            print(f"{'':<28}imports {', '.join(eager)}")
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(main())
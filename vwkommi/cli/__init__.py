@@ -0,0 +1,5 @@
+"""Sub commands of the command line interface.
+
+Every sub command lives in its own module with a _run_ function. The modules are only imported
+when their sub command is used, so heavy modules are not loaded for e.g. _--help_.
+"""
@@ -0,0 +1,101 @@
+"""Helpers shared by the sub commands"""
+import argparse
+
+LOGIN_ERROR = (
+    "An error occurred during login. Please check your user data "
+    "or if the VW URLs are still valid. You have to accept the "
+    "terms of use of VW as well. Therefore login with your browser once.!"
+)
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the arguments overriding the settings."""
+    parser.add_argument(
+        "-b",
+        "--base-dir",
+        dest="base_dir",
+        default=None,
+        help="Directory to store downloaded data to",
+    )
+    parser.add_argument(
+        "-w",
+        "--worker-count",
+        dest="worker_count",
+        type=int,
+        default=None,
+        help="Number of workers to use for requests.",
+    )
+    parser.add_argument(
+        "-u",
+        "--username",
+        dest="username",
+        default=None,
+        help="Username to make requests with",
+    )
+    parser.add_argument(
+        "-p",
+        "--password",
+        dest="password",
+        default=None,
+        help="Password for username",
+    )
+    parser.add_argument(
+        "-P",
+        "--prefix-list",
+        dest="prefix_list",
+        default=None,
+        help="List of prefix numbers to try",
+    )
+    parser.add_argument(
+        "-s",
+        "--skip-fin-details",
+        dest="skip_fin_details",
+        default=None,
+        help="Weather fin details should be skipped or not",
+    )
+    parser.add_argument(
+        "-c",
+        "--commission-number-range",
+        dest="commission_number_range",
+        default=None,
+        help='Commission number range (e.g. [("AF", 5000, 9999, 4),("AG", 0, 9999, 4)])',
+    )
+
+
+def override_default_settings(args) -> bool:
+    """Initializes the settings and overrides them by the arguments."""
+    # pylint: disable=import-outside-toplevel
+    from vwkommi.settings import (
+        BASE_DIR,
+        WORKER_COUNT,
+        VW_USERNAME,
+        VW_PASSWORD,
+        VW_ACCOUNTS,
+        PREFIX_LIST,
+        SKIP_VIN_DETAILS,
+        COMMISSION_NUMBER_RANGE,
+        Settings,
+    )
+
+    settings = Settings(
+        BASE_DIR,
+        WORKER_COUNT,
+        VW_USERNAME,
+        VW_PASSWORD,
+        PREFIX_LIST,
+        SKIP_VIN_DETAILS,
+        COMMISSION_NUMBER_RANGE,
+        VW_ACCOUNTS,
+    )
+    if settings.update_settings(
+        base_dir=args.base_dir,
+        worker_count=args.worker_count,
+        username=args.username,
+        password=args.password,
+        prefix_list=args.prefix_list,
+        skip_fin_details=args.skip_fin_details,
+        commission_number_range=args.commission_number_range,
+    ):
+        return True
+    print("There was an error while overwriting the settings values.")
+    return False
@@ -0,0 +1,38 @@
+"""diff sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+import sys
+
+
+def run(argv: List[str]) -> None:
+    """Compares two output files.
+
+    The changes (added and removed cars, changed fields and specifications) are written as one
+    JSON object per line.
+    """
+    parser = argparse.ArgumentParser(description="VW Kommi Diff")
+    parser.add_argument("old", help="Older output file")
+    parser.add_argument("new", help="Newer output file")
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        default=None,
+        help="File to write the changes to (default: stdout)",
+    )
+    args = parser.parse_args(argv)
+
+    from vwkommi.output.diff import OutputDiff
+
+    output_diff = OutputDiff(args.old, args.new)
+    try:
+        if args.output is None:
+            output_diff.write(sys.stdout)
+            return
+        with open(args.output, "w", encoding="utf-8") as file:
+            count = output_diff.write(file)
+        print(f"{count} changes written to {args.output}")
+    except (OSError, ValueError) as error:
+        print(f"Could not compare the files: {error}")
+        sys.exit(1)
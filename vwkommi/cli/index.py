@@ -0,0 +1,30 @@
+"""index sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+import sys
+
+
+def run(argv: List[str]) -> None:
+    """Builds the specification index of the output files of a scan.
+
+    The index is used by the _query_ sub command.
+    """
+    parser = argparse.ArgumentParser(description="VW Kommi Index")
+    parser.add_argument("files", nargs="+", help="Output files of a scan")
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        default=None,
+        help="File to write the index to (default: index_<time>.json next to the files)",
+    )
+    args = parser.parse_args(argv)
+
+    from vwkommi.output.index import build_index
+
+    try:
+        print(f"Index written to {build_index(args.files, args.output)}")
+    except (OSError, ValueError) as error:
+        print(f"Could not build the index: {error}")
+        sys.exit(1)
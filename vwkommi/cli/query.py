@@ -0,0 +1,59 @@
+"""query sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+import os
+import sys
+
+
+def run(argv: List[str]) -> None:
+    """Prints the commission numbers matching a query on a specification index.
+
+    See _vwkommi.output.index.SpecIndex_ for the query syntax.
+    """
+    from vwkommi.settings import BASE_DIR
+
+    parser = argparse.ArgumentParser(description="VW Kommi Query")
+    parser.add_argument(
+        "query",
+        help='Query, e.g. \'spec:"Wärmepumpe*" AND NOT model:"ID.4 GTX"\'',
+    )
+    parser.add_argument(
+        "-i",
+        "--index",
+        dest="index",
+        default=None,
+        help="Index file to query (default: newest index within the raw_data directory)",
+    )
+    parser.add_argument(
+        "-b",
+        "--base-dir",
+        dest="base_dir",
+        default=BASE_DIR,
+        help="Directory containing the raw_data directory",
+    )
+    parser.add_argument(
+        "-c",
+        "--count",
+        dest="count",
+        action="store_true",
+        help="Only print the number of matching commission numbers",
+    )
+    args = parser.parse_args(argv)
+
+    from vwkommi.output.index import latest_index, SpecIndex
+
+    index_path = args.index or latest_index(os.path.join(args.base_dir, "raw_data"))
+    if not index_path:
+        print("No index found. Build one with the index sub command first.")
+        sys.exit(1)
+    try:
+        commission_numbers = SpecIndex(index_path).query(args.query)
+    except (OSError, ValueError) as error:
+        print(f"Could not run the query: {error}")
+        sys.exit(1)
+    if args.count is True:
+        print(len(commission_numbers))
+        return
+    for commission_number in commission_numbers:
+        print(commission_number)
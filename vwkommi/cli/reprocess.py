@@ -0,0 +1,42 @@
+"""reprocess sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+import sys
+import zlib
+
+
+def run(argv: List[str]) -> None:
+    """Regenerates output files from archives written with _request --archive_.
+
+    No requests are made. The output files are written next to the archives.
+    """
+    parser = argparse.ArgumentParser(description="VW Kommi Reprocess")
+    parser.add_argument("archives", nargs="+", help="Archive files to reprocess")
+    parser.add_argument(
+        "-w",
+        "--worker-count",
+        dest="worker_count",
+        type=int,
+        default=None,
+        help="Number of processes to use (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        dest="force",
+        action="store_true",
+        help="Overwrite existing output files",
+    )
+    args = parser.parse_args(argv)
+
+    from vwkommi.output.reprocess import reprocess_archive
+
+    for archive in args.archives:
+        try:
+            output_path = reprocess_archive(archive, args.worker_count, args.force)
+        except (OSError, ValueError, KeyError, EOFError, zlib.error) as error:
+            print(f"Could not reprocess {archive}: {error}")
+            sys.exit(1)
+        if output_path:
+            print(f"Written {output_path}")
@@ -0,0 +1,138 @@
+"""request sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+from vwkommi.cli.common import add_settings_arguments, LOGIN_ERROR, override_default_settings
+
+
+def run(argv: List[str]) -> None:
+    """Starts requesting data from the VW server.
+
+    The data is somewhat filtered and stored into the _raw_data_ subdirectory.
+    """
+    parser = argparse.ArgumentParser(description="VW Kommi Requests")
+    add_settings_arguments(parser)
+    parser.add_argument(
+        "-f",
+        "--find-prefix",
+        dest="commission_number_find",
+        default=None,
+        help="Tries to find the prefix for a specific commission number",
+    )
+    parser.add_argument(
+        "-a",
+        "--add-to-profile",
+        dest="commission_number_add",
+        default=None,
+        help="Tries to find the prefix for a specific commission number",
+    )
+    parser.add_argument(
+        "-A",
+        "--archive",
+        dest="archive",
+        action="store_true",
+        help="Archive the unfiltered responses to be able to reprocess them later on",
+    )
+    parser.add_argument(
+        "-i",
+        "--index",
+        dest="index",
+        action="store_true",
+        help="Build the specification index of the output files after requesting",
+    )
+    parser.add_argument(
+        "-S",
+        "--speculative",
+        dest="speculative",
+        type=int,
+        default=1,
+        help="Number of prefix and year combinations to request at once (default: 1)",
+    )
+    parser.add_argument(
+        "--request-budget",
+        dest="request_budget",
+        type=int,
+        default=None,
+        help="Maximum number of additional requests of speculative probing per run",
+    )
+    parser.add_argument(
+        "-d",
+        "--dense-first",
+        dest="dense_first",
+        action="store_true",
+        help="Request the neighbourhood of known cars first",
+    )
+    parser.add_argument(
+        "-t",
+        "--trace",
+        dest="trace",
+        default=None,
+        help="File to write timed spans of all requests to (Chrome trace event format)",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        default=None,
+        help="File to write a cProfile capture of the main loop to",
+    )
+    args = parser.parse_args(argv)
+    if override_default_settings(args) is False:
+        return
+
+    from vwkommi.request.prefix_cache import PrefixCache
+    from vwkommi.settings import Settings
+
+    prefix_cache = PrefixCache(Settings().base_dir)
+    if args.commission_number_find is not None:
+        # the prefix and year of a commission number never change
+        result = prefix_cache.get(args.commission_number_find)
+        if result is not None:
+            prefix, year = result
+            print(f"Prefix: {prefix}, year: {year}")
+            return
+
+    from vwkommi.request.request import DataRequest
+
+    data_request = DataRequest()
+    if data_request.is_authenticated() is False:
+        print(LOGIN_ERROR)
+        return
+    if args.commission_number_find is not None:
+        result = data_request.find_prefix(args.commission_number_find)
+        if isinstance(result, bool):
+            print("No prefix year combination found!")
+        else:
+            prefix, year = result
+            prefix_cache.set(args.commission_number_find, prefix, year)
+            print(f"Prefix: {prefix}, year: {year}")
+        return
+    if args.commission_number_add is not None:
+        if data_request.add_to_profile(args.commission_number_add) is True:
+            print(f"{args.commission_number_add} added to profile")
+        else:
+            print(f"Could not add {args.commission_number_add} to profile")
+        return
+
+    import cProfile
+    from vwkommi.output.index import build_index
+
+    if args.dense_first is True:
+        data_request.enable_dense_scheduling()
+    if args.speculative > 1:
+        data_request.enable_speculative_probing(args.speculative, args.request_budget)
+    tracer = data_request.enable_tracing() if args.trace is not None else None
+    profiler = cProfile.Profile() if args.profile is not None else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        files = data_request.do_requests(archive=args.archive)
+        if args.index is True and files:
+            print(f"Index written to {build_index(files)}")
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile}")
+        if tracer is not None:
+            tracer.export(args.trace)
+            print(f"Trace written to {args.trace}")
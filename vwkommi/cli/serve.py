@@ -0,0 +1,39 @@
+"""serve sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+from vwkommi.cli.common import add_settings_arguments, LOGIN_ERROR, override_default_settings
+
+
+def run(argv: List[str]) -> None:
+    """Starts a daemon keeping one authenticated session alive.
+
+    Jobs (scan, find_prefix, add_to_profile) are accepted via a local HTTP API. See
+    _vwkommi.server.server.JobRequestHandler_ for the available endpoints.
+    """
+    from vwkommi.settings import SERVE_HOST, SERVE_PORT
+
+    parser = argparse.ArgumentParser(description="VW Kommi Daemon")
+    add_settings_arguments(parser)
+    parser.add_argument(
+        "-H",
+        "--host",
+        dest="host",
+        default=SERVE_HOST,
+        help=f"Host to bind the job API to (default: {SERVE_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        default=SERVE_PORT,
+        help=f"Port to bind the job API to (default: {SERVE_PORT})",
+    )
+    args = parser.parse_args(argv)
+    if override_default_settings(args) is False:
+        return
+
+    from vwkommi.server.server import serve
+
+    if serve(args.host, args.port) is False:
+        print(LOGIN_ERROR)
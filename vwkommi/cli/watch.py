@@ -0,0 +1,37 @@
+"""watch sub command"""
+# pylint: disable=import-outside-toplevel
+from typing import List
+import argparse
+from vwkommi.cli.common import add_settings_arguments, LOGIN_ERROR, override_default_settings
+
+
+def run(argv: List[str]) -> None:
+    """Rescans the commission number ranges continuously.
+
+    Every range gets its own interval depending on how often its data changed recently. The
+    snapshots are stored into the _raw_data_ subdirectory like the ones of _request_.
+    """
+    parser = argparse.ArgumentParser(description="VW Kommi Watch")
+    add_settings_arguments(parser)
+    parser.add_argument(
+        "-o",
+        "--once",
+        dest="once",
+        action="store_true",
+        help="Only scan the ranges which are due and exit (e.g. for cron jobs)",
+    )
+    args = parser.parse_args(argv)
+    if override_default_settings(args) is False:
+        return
+
+    from vwkommi.request.request import DataRequest
+    from vwkommi.watch.watch import Watch
+
+    data_request = DataRequest()
+    if data_request.is_authenticated() is False:
+        print(LOGIN_ERROR)
+        return
+    try:
+        Watch(data_request).run(once=args.once)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
@@ -0,0 +1,85 @@
+"""Module comparing two output files"""
+from typing import Dict, Iterator, TextIO
+import json
+from vwkommi.output.reader import read_output
+
+
+class OutputDiff:
+    """Class comparing two output files in a single sequential pass.
+
+    _DataRequest.do_requests_ writes the cars sorted by commission number, so both files are
+    merged like in a merge join and only one car of each file is held in memory.
+    """
+
+    SECTIONS = ["data", "details", "production", "image"]
+
+    def __init__(self, old_path: str, new_path: str) -> None:
+        self.old_path = old_path
+        self.new_path = new_path
+
+    def changes(self) -> Iterator[Dict]:
+        """Yields all changes between the old and the new file.
+
+        Every change is a dict with a _type_ being one of _added_, _removed_, _changed_,
+        _spec_added_ or _spec_removed_.
+        """
+        old_iter = OutputDiff.__sorted(read_output(self.old_path), self.old_path)
+        new_iter = OutputDiff.__sorted(read_output(self.new_path), self.new_path)
+        old = next(old_iter, None)
+        new = next(new_iter, None)
+        while old is not None or new is not None:
+            if new is None or (old is not None and old[0] < new[0]):
+                yield {"type": "removed", "commission_number": old[0]}
+                old = next(old_iter, None)
+            elif old is None or new[0] < old[0]:
+                yield {"type": "added", "commission_number": new[0], "data": new[1][0]}
+                new = next(new_iter, None)
+            else:
+                yield from OutputDiff.__compare(new[0], old[1], new[1])
+                old = next(old_iter, None)
+                new = next(new_iter, None)
+
+    def write(self, file: TextIO) -> int:
+        """Writes all changes as NDJSON and returns the number of changes."""
+        count = 0
+        for change in self.changes():
+            file.write(json.dumps(change, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+    @staticmethod
+    def __compare(kommi: str, old: list, new: list) -> Iterator[Dict]:
+        for index, section in enumerate(OutputDiff.SECTIONS):
+            old_section = old[index] or {}
+            new_section = new[index] or {}
+            for field in sorted(set(old_section) | set(new_section)):
+                if field == "specifications":
+                    continue
+                if old_section.get(field) != new_section.get(field):
+                    yield {
+                        "type": "changed",
+                        "commission_number": kommi,
+                        "section": section,
+                        "field": field,
+                        "old": old_section.get(field),
+                        "new": new_section.get(field),
+                    }
+        old_specs = [spec["codeText"] for spec in old[1].get("specifications", [])]
+        new_specs = [spec["codeText"] for spec in new[1].get("specifications", [])]
+        old_set = set(old_specs)
+        new_set = set(new_specs)
+        for spec in new_specs:
+            if spec not in old_set:
+                yield {"type": "spec_added", "commission_number": kommi, "codeText": spec}
+        for spec in old_specs:
+            if spec not in new_set:
+                yield {"type": "spec_removed", "commission_number": kommi, "codeText": spec}
+
+    @staticmethod
+    def __sorted(cars: Iterator, path: str) -> Iterator:
+        last = None
+        for car in cars:
+            if last is not None and car[0] <= last:
+                raise ValueError(f"{path} is not sorted by commission number.")
+            last = car[0]
+            yield car
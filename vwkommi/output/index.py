@@ -0,0 +1,213 @@
+"""Module indexing the specifications and model names of output files
+
+The index maps every specification (_spec:<codeText>_) and model name (_model:<modelName>_)
+to a sorted list of the cars having it. The lists are stored delta and varint encoded.
+"""
+from typing import Dict, Iterator, List, Set
+import base64
+import json
+import os
+import re
+from vwkommi.output.reader import read_output
+
+OUTPUT_FILE_PATTERN = re.compile(r"output_.*_(\d{4}-\d{2}-\d{2}T\d{2}\.\d{2}\.\d{2})\.json")
+
+
+def encode_postings(postings: List[int]) -> str:
+    """Encodes a sorted list of ids as base64 string of varint encoded deltas."""
+    data = bytearray()
+    last = 0
+    for posting in postings:
+        delta = posting - last
+        last = posting
+        while delta >= 0x80:
+            data.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        data.append(delta)
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def decode_postings(encoded: str) -> List[int]:
+    """Decodes a list encoded by _encode_postings_."""
+    postings = []
+    last = 0
+    delta = 0
+    shift = 0
+    for byte in base64.b64decode(encoded):
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        last += delta
+        postings.append(last)
+        delta = 0
+        shift = 0
+    return postings
+
+
+def build_index(output_files: List[str], index_path: str = None) -> str:
+    """Builds the index of the output files of a scan and returns its path.
+
+    Without _index_path_ the index is written next to the first output file as
+    _index_<time>.json_ using the time of the scan. Raises a _ValueError_ if the output files
+    belong to different scans. Cars contained in several files (overlapping ranges) are indexed
+    once.
+    """
+    scans = set()
+    for path in output_files:
+        match = OUTPUT_FILE_PATTERN.fullmatch(os.path.basename(path))
+        if match is not None:
+            scans.add(match.group(1))
+    if len(scans) > 1:
+        raise ValueError(f"The output files belong to different scans ({', '.join(sorted(scans))})")
+    if index_path is None:
+        scan = scans.pop() if scans else "scan"
+        index_path = os.path.join(os.path.dirname(output_files[0]), f"index_{scan}.json")
+    commission_numbers = []
+    indexed = set()
+    postings: Dict[str, List[int]] = {}
+    for path in output_files:
+        for kommi, (data, details, _, _) in read_output(path):
+            if kommi in indexed:
+                continue
+            indexed.add(kommi)
+            doc_id = len(commission_numbers)
+            commission_numbers.append(kommi)
+            terms = {f"spec:{spec['codeText']}" for spec in details.get("specifications", [])}
+            if data.get("modelName"):
+                terms.add(f"model:{data['modelName']}")
+            for term in terms:
+                postings.setdefault(term, []).append(doc_id)
+    with open(index_path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "files": [os.path.basename(path) for path in output_files],
+                "commissionNumbers": commission_numbers,
+                "terms": {
+                    term: encode_postings(doc_ids) for term, doc_ids in sorted(postings.items())
+                },
+            },
+            file,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    return index_path
+
+
+class SpecIndex:
+    """Class answering queries on an index built by _build_index_.
+
+    A query combines terms with _AND_, _OR_, _NOT_ and parentheses. A term is either
+    _spec:"<codeText>"_ or _model:"<modelName>"_. A term without prefix is a specification.
+    A trailing _*_ matches every term beginning with the given text. Example:
+
+        spec:"Wärmepumpe*" AND NOT (model:"ID.4 GTX" OR model:"ID.5 GTX")
+    """
+
+    TOKEN_PATTERN = re.compile(
+        r'\s*(?:(?P<paren>[()])|(?P<term>(?:(?:spec|model):)?(?:"[^"]*"|[^\s()"]+)))'
+    )
+
+    def __init__(self, index_path: str) -> None:
+        with open(index_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+        self.commission_numbers = index["commissionNumbers"]
+        self.terms = index["terms"]
+        self.tokens = []
+        self.position = 0
+
+    def query(self, query: str) -> List[str]:
+        """Returns the sorted commission numbers matching the query.
+
+        Raises a _ValueError_ if the query is invalid.
+        """
+        self.tokens = SpecIndex.__tokenize(query)
+        self.position = 0
+        doc_ids = self.__parse_or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.position]}")
+        # indexes of older versions may contain a commission number more than once
+        return sorted({self.commission_numbers[doc_id] for doc_id in doc_ids})
+
+    def __parse_or(self) -> Set[int]:
+        doc_ids = self.__parse_and()
+        while self.__accept("OR"):
+            doc_ids = doc_ids | self.__parse_and()
+        return doc_ids
+
+    def __parse_and(self) -> Set[int]:
+        doc_ids = self.__parse_not()
+        while self.__accept("AND"):
+            doc_ids = doc_ids & self.__parse_not()
+        return doc_ids
+
+    def __parse_not(self) -> Set[int]:
+        if self.__accept("NOT"):
+            return set(range(len(self.commission_numbers))) - self.__parse_not()
+        if self.__accept("("):
+            doc_ids = self.__parse_or()
+            if not self.__accept(")"):
+                raise ValueError("Missing )")
+            return doc_ids
+        if self.position >= len(self.tokens):
+            raise ValueError("Unexpected end of query")
+        token = self.tokens[self.position]
+        if token in ["AND", "OR", ")"]:
+            raise ValueError(f"Unexpected {token}")
+        self.position += 1
+        return self.__lookup(token)
+
+    def __accept(self, token: str) -> bool:
+        if self.position < len(self.tokens) and self.tokens[self.position] == token:
+            self.position += 1
+            return True
+        return False
+
+    def __lookup(self, token: str) -> Set[int]:
+        field, _, value = token.partition(":")
+        if not value or field not in ["spec", "model"]:
+            field, value = "spec", token
+        if value.startswith('"') and value.endswith('"') and len(value) >= 2:
+            value = value[1:-1]
+        doc_ids = set()
+        for term in self.__matching_terms(f"{field}:{value}"):
+            doc_ids.update(decode_postings(self.terms[term]))
+        return doc_ids
+
+    def __matching_terms(self, term: str) -> Iterator[str]:
+        if not term.endswith("*"):
+            if term in self.terms:
+                yield term
+            return
+        prefix = term[:-1]
+        for candidate in self.terms:
+            if candidate.startswith(prefix):
+                yield candidate
+
+    @staticmethod
+    def __tokenize(query: str) -> List[str]:
+        tokens = []
+        position = 0
+        query = query.strip()
+        while position < len(query):
+            match = SpecIndex.TOKEN_PATTERN.match(query, position)
+            if match is None:
+                raise ValueError(f"Invalid query near: {query[position:]}")
+            tokens.append(match.group("paren") or match.group("term"))
+            position = match.end()
+        return tokens
+
+
+def latest_index(directory: str) -> str:
+    """Returns the path of the most recently written index within the directory or an empty string.
+
+    The modification time is used since indexes may be named freely (e.g. _index_scan.json_).
+    """
+    if not os.path.isdir(directory):
+        return ""
+    indexes = [
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith("index_") and name.endswith(".json")
+    ]
+    return max(indexes, key=os.path.getmtime) if indexes else ""
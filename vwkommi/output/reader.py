@@ -0,0 +1,29 @@
+"""Module reading the output files written by _DataRequest.do_requests_"""
+from typing import Iterator, Tuple
+import json
+
+
+def read_output(path: str) -> Iterator[Tuple[str, list]]:
+    """Yields the commission number and its data for every car of an output file.
+
+    The output files contain one car per line, so the file is read line by line and only a single
+    car is held in memory. The data is a list of vehicle data, details, production data and image
+    data.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.rstrip("\n")
+            if line in ["{", "}", ""]:
+                continue
+            if line.endswith(","):
+                line = line[:-1]
+            kommi, _, value = line.partition('":')
+            yield kommi[1:], json.loads(value)
+
+
+def read_commission_numbers(path: str) -> Iterator[str]:
+    """Yields the commission numbers of an output file without parsing the data of the cars."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.startswith('"'):
+                yield line[1 : line.index('"', 1)]
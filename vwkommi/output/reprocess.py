@@ -0,0 +1,74 @@
+"""Module regenerating output files from archived responses"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+import gzip
+import json
+import os
+import re
+from vwkommi.output.writer import write_output
+from vwkommi.request.filters import filter_responses
+
+# number of archived cars read at once
+BATCH_SIZE = 10000
+
+
+def process_line(line: str) -> Tuple[str, str]:
+    """Filters a single archived car and returns its commission number and JSON list."""
+    raw = json.loads(line)
+    return raw["commissionNumber"], "[" + ",".join(
+        filter_responses(raw["data"], raw["details"], raw["production"], raw["image"])
+    ) + "]"
+
+
+def read_batch(file, path: str) -> Tuple[List[str], bool]:
+    """Reads up to _BATCH_SIZE_ complete lines of an archive.
+
+    Returns the lines and whether the end of the archive was reached. If the scan writing the
+    archive was interrupted, the lines read until then are kept and a partial last line is dropped.
+    """
+    batch = []
+    while len(batch) < BATCH_SIZE:
+        try:
+            line = file.readline()
+        except EOFError:
+            print(f"{path} is truncated. Using the complete entries only.")
+            return batch, True
+        if not line:
+            return batch, True
+        if not line.endswith("\n"):
+            print(f"{path} ends with an incomplete entry. Using the complete entries only.")
+            return batch, True
+        batch.append(line)
+    return batch, False
+
+
+def reprocess_archive(path: str, worker_count: int = None, force: bool = False) -> str:
+    """Regenerates the output file of an archive written by _DataRequest.do_requests_.
+
+    The cars are filtered in parallel by _worker_count_ processes (default: number of CPUs). The
+    output file is written next to the archive using the time of the original scan. An existing
+    output file is only overwritten with _force_ set. Returns the path of the output file or an
+    empty string on error.
+    """
+    match = re.fullmatch(r"archive_(.*)\.ndjson\.gz", os.path.basename(path))
+    if match is None:
+        print(f"{path} is not an archive file.")
+        return ""
+    output_path = os.path.join(os.path.dirname(path), f"output_{match.group(1)}.json")
+    if force is False and os.path.exists(output_path):
+        print(f"{output_path} already exists. Use --force to overwrite it.")
+        return ""
+    data_dict = {}
+    with gzip.open(path, "rt", encoding="utf-8") as file, ProcessPoolExecutor(
+        max_workers=worker_count
+    ) as executor:
+        done = False
+        while done is False:
+            batch, done = read_batch(file, path)
+            for kommi, value in executor.map(process_line, batch, chunksize=256):
+                data_dict[kommi] = value
+    if not data_dict:
+        print(f"{path} does not contain any complete entries.")
+        return ""
+    write_output(output_path, data_dict)
+    return output_path
@@ -0,0 +1,24 @@
+"""Module writing output files"""
+from typing import Dict
+
+
+def write_output(path: str, data_dict: Dict[str, str]) -> None:
+    """Writes the cars sorted by commission number to an output file.
+
+    The values of _data_dict_ are the JSON lists of the cars. Every car is written to its own line.
+    """
+    with open(
+        path,
+        "w",
+        encoding="utf-8",
+    ) as file:
+        file.write("{\n")  # first line
+
+        first = True  # just to put all the commas correctly
+        for kommi_key in sorted(data_dict):
+            if first is False:
+                file.write(",\n")
+            first = False
+            file.write('"' + kommi_key + '":' + data_dict[kommi_key])
+
+        file.write("\n}\n")  # last line
@@ -1,8 +1,12 @@
 """Module for authentication with VW server"""
+import json
+import os
 import re
+import threading
+import time
 from typing import Dict, List
 import requests
-from vwkommi.settings import Settings
+from vwkommi.settings import TOKEN_CACHE, TOKEN_CACHE_TTL, Settings
 
 
 class Auth:  # pylint: disable=too-few-public-methods
@@ -23,21 +27,44 @@ class Auth:  # pylint: disable=too-few-public-methods
         "583bb197684b@apps_vw-dilab_com/login/authenticate"
     )
     TOKEN_URL = "https://www.volkswagen.de/app/authproxy/vw-de/tokens"
+    TOKEN_CACHE_FILE = ".token_cache.json"
 
-    def __init__(self) -> None:
-        """init"""
+    cache_lock = threading.Lock()
+
+    def __init__(self, username: str = None, password: str = None) -> None:
+        """init
+
+        Without _username_ and _password_ the user data of the settings is used.
+        """
         self.token = ""
+        self.username = username
+        self.password = password
 
     def get_token(self) -> str:
-        """Gets the authentication token"""
+        """Gets the authentication token
+
+        With _TOKEN_CACHE_ enabled a token of a previous run is reused while it is younger than
+        _TOKEN_CACHE_TTL_ seconds.
+        """
         if not self.token:
+            if TOKEN_CACHE is True:
+                self.token = self.__cached_token()
+                if self.token:
+                    return self.token
             if not self.__do_login():
                 return ""
+            if TOKEN_CACHE is True:
+                self.__update_token_cache(self.token)
         return self.token
 
     def reset_token(self) -> None:
-        """Resets auth token."""
+        """Resets auth token.
+
+        The token is removed from the token cache as well since it was not accepted anymore.
+        """
         self.token = ""
+        if TOKEN_CACHE is True:
+            self.__update_token_cache(None)
 
     def is_authenticated(self) -> bool:
         """Checks if there is a token."""
@@ -49,8 +76,8 @@ class Auth:  # pylint: disable=too-few-public-methods
         On success _self.token_ is set.
         """
         settings = Settings()
-        email = settings.username
-        pwd = settings.password
+        email = self.__username()
+        pwd = self.password if self.password is not None else settings.password
 
         # create session
         request = requests.session()
@@ -130,6 +157,54 @@ class Auth:  # pylint: disable=too-few-public-methods
         self.token = "Bearer " + tmp[0]
         return True
 
+    def __username(self) -> str:
+        return self.username if self.username is not None else Settings().username
+
+    @staticmethod
+    def __token_cache_path() -> str:
+        return os.path.join(Settings().base_dir, Auth.TOKEN_CACHE_FILE)
+
+    @staticmethod
+    def __load_token_cache() -> Dict:
+        try:
+            with open(Auth.__token_cache_path(), "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def __cached_token(self) -> str:
+        """Returns the cached token of the user if it did not expire yet."""
+        with Auth.cache_lock:
+            entry = Auth.__load_token_cache().get(self.__username())
+        if not isinstance(entry, dict) or entry.get("expires", 0) <= time.time():
+            return ""
+        return entry.get("token", "")
+
+    def __update_token_cache(self, token: str) -> None:
+        """Stores _token_ for the user or removes the entry of the user if _token_ is None."""
+        with Auth.cache_lock:
+            entries = Auth.__load_token_cache()
+            if token is None:
+                if entries.pop(self.__username(), None) is None:
+                    return
+            else:
+                entries[self.__username()] = {
+                    "token": token,
+                    "expires": time.time() + TOKEN_CACHE_TTL,
+                }
+            path = Auth.__token_cache_path()
+            try:
+                # the file contains credentials, so it is readable by the owner only
+                descriptor = os.open(
+                    f"{path}.tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+                )
+                with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                    json.dump(entries, file)
+                os.replace(f"{path}.tmp", path)
+            except OSError as error:
+                print(f"Could not write the token cache: {error}")
+
     @staticmethod
     def __get_values(fields: List[str], request_text: str) -> Dict:
         return_dict = {}
@@ -0,0 +1,17 @@
+"""Module combining cancel events"""
+import threading
+
+
+class AnyEvent:  # pylint: disable=too-few-public-methods
+    """Cancel event which is set as soon as one of its events is set.
+
+    It is passed wherever a _threading.Event_ is checked with _is_set_. Events being None are
+    ignored.
+    """
+
+    def __init__(self, *events: threading.Event) -> None:
+        self.events = [event for event in events if event is not None]
+
+    def is_set(self) -> bool:
+        """Checks if one of the events is set."""
+        return any(event.is_set() for event in self.events)
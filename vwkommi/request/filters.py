@@ -0,0 +1,96 @@
+"""Module filtering the responses of the VW server
+
+The functions do not perform any requests, so they are used for new requests as well as for
+reprocessing archived responses.
+"""
+import json
+from typing import Tuple
+
+
+# pylint: disable=too-many-branches
+def filter_responses(
+    data_response: dict,
+    details_response: dict,
+    production_json: dict = None,
+    image_json: dict = None,
+) -> Tuple[str, str, str, str]:
+    """Filters the raw responses of a car and returns them as JSON strings.
+
+    _production_json_ and _image_json_ are _None_ if the VIN details were not requested. The
+    responses are modified in place.
+    """
+    # get production data and line drawing if VIN or store some default values
+    production_status = [
+        {"codeText": "Produktionsstatus: keine FIN"},
+        {"codeText": "FIN verbunden: nein"},
+    ]
+    image_status = {"codeText": "Bild: keine FIN"}
+    if production_json is not None:
+        production_status = [
+            {"codeText": f'Produktionsstatus: {production_json["stage"]}'},
+            {"codeText": f'FIN verbunden: {production_json["connected"]}'},
+        ]
+        production_json = {
+            "stage": production_json["stage"],
+            "connected": production_json["connected"],
+        }
+    if image_json is not None:
+        has_images = len(image_json["imageUrls"]) > 1
+        image_status_str = "Strichzeichnung" if has_images is False else "Normal"
+        image_status = {"codeText": f"Bild: {image_status_str}"}
+        image_json = {"hasImages": has_images}
+
+    # filter data
+    if (
+        not "specifications" in details_response
+    ):  # some commission numbers are without specs
+        details_response["specifications"] = []
+    model_name = data_response["modelName"] if "modelName" in data_response else ""
+    if model_name == "ID.3 Pro S":
+        model_name = "ID.3 Pro S (4-Sitzer)"
+    if model_name == "ID.3 Pro S (4-Sitzer)":
+        for spec in details_response["specifications"]:
+            if spec["codeText"][:11] == "3 Rücksitze":
+                model_name = "ID.3 Pro S (5-Sitzer)"
+                break
+    elif model_name == "ID.4":
+        model_name = "ID.4 GTX"
+    elif model_name == "ID.5":
+        model_name = "ID.5 GTX"
+    if "modelName" in data_response:
+        data_response["modelName"] = model_name
+
+    # apply some theories
+    pedal_spec = False
+    service_spec = False
+    for spec in details_response["specifications"]:
+        if service_spec is True:
+            if spec["codeText"].startswith("Umweltbonus"):
+                details_response["specifications"].append(
+                    {"codeText": "eGolf-lu: A", "origin": ""}
+                )
+            else:
+                details_response["specifications"].append(
+                    {"codeText": "eGolf-lu: B", "origin": ""}
+                )
+            break
+        if pedal_spec is True:
+            if spec["codeText"].startswith("Serviceanzeige"):
+                service_spec = True
+            else:
+                details_response["specifications"].append(
+                    {"codeText": "eGolf-lu: B", "origin": ""}
+                )
+                break
+        pedal_spec = spec["codeText"].startswith("Fußhebelwerk") or spec[
+            "codeText"
+        ].startswith("Pedale")
+    details_response["specifications"].extend(production_status)
+    details_response["specifications"].append(image_status)
+
+    return (
+        json.dumps(data_response, separators=(",", ":"), ensure_ascii=False),
+        json.dumps(details_response, separators=(",", ":"), ensure_ascii=False),
+        json.dumps(production_json, separators=(",", ":"), ensure_ascii=False),
+        json.dumps(image_json, separators=(",", ":"), ensure_ascii=False),
+    )
@@ -0,0 +1,47 @@
+"""Module caching the prefix and year of commission numbers"""
+from typing import Optional, Tuple
+import json
+import os
+import threading
+
+
+class PrefixCache:
+    """Persistent cache of the results of _DataRequest.find_prefix_.
+
+    The prefix and year of a commission number never change, so found combinations are kept
+    forever. Commission numbers without a match are not cached since the car might show up later.
+    """
+
+    FILE_NAME = "prefix_cache.json"
+
+    def __init__(self, base_dir: str) -> None:
+        self.path = os.path.join(base_dir, PrefixCache.FILE_NAME)
+        self.lock = threading.Lock()
+
+    def get(self, commission_number: str) -> Optional[Tuple[int, int]]:
+        """Returns the cached prefix and year of _commission_number_ or None."""
+        entry = self.__load().get(commission_number.upper())
+        if entry is None:
+            return None
+        return entry[0], entry[1]
+
+    def set(self, commission_number: str, prefix: int, year: int) -> None:
+        """Stores the prefix and year of _commission_number_."""
+        with self.lock:
+            entries = self.__load()
+            entries[commission_number.upper()] = [prefix, year]
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    json.dump(entries, file, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as error:
+                print(f"Could not write the prefix cache: {error}")
+
+    def __load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
@@ -0,0 +1,53 @@
+"""Module collecting statistics about probing the prefix and year of commission numbers"""
+import threading
+
+
+class ProbeStats:
+    """Class counting the requests and the latency needed to find the prefix and year.
+
+    It is used to compare sequential and speculative probing.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.commission_numbers = 0
+        self.hits = 0
+        self.requests = 0
+        self.speculative_requests = 0
+        self.cancelled_requests = 0
+        self.hit_latencies = []
+
+    def add(
+        self,
+        requests: int,
+        latency: float,
+        hit: bool,
+        speculative_requests: int = 0,
+        cancelled_requests: int = 0,
+    ) -> None:
+        """Adds the result of probing a single commission number."""
+        with self.lock:
+            self.commission_numbers += 1
+            self.requests += requests
+            self.speculative_requests += speculative_requests
+            self.cancelled_requests += cancelled_requests
+            if hit is True:
+                self.hits += 1
+                self.hit_latencies.append(latency)
+
+    def summary(self) -> str:
+        """Returns a human readable summary."""
+        with self.lock:
+            if self.commission_numbers == 0:
+                return "Probing: nothing probed"
+            latencies = sorted(self.hit_latencies)
+            average = sum(latencies) / len(latencies) if latencies else 0.0
+            p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+            return (
+                f"Probing: {self.hits} of {self.commission_numbers} commission numbers found "
+                f"with {self.requests} requests "
+                f"({self.requests / self.commission_numbers:.2f} per commission number), "
+                f"latency of hits avg {average:.3f}s p95 {p95:.3f}s, "
+                f"speculative requests {self.speculative_requests} "
+                f"({self.cancelled_requests} cancelled before being sent)"
+            )
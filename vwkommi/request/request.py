@@ -1,14 +1,27 @@
 """Module performing requests and storing data"""
 from datetime import datetime
-from typing import Union
-from concurrent.futures import as_completed, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, List, Union
+from concurrent.futures import as_completed, wait, FIRST_COMPLETED, ThreadPoolExecutor
+import asyncio
+import collections
+import gzip
 import json
 import os
 import requests
 import secrets
+import threading
 import time
-from vwkommi.request.auth import Auth
-from vwkommi.settings import Settings
+from vwkommi.output.reader import read_commission_numbers
+from vwkommi.output.writer import write_output
+from vwkommi.request.cancel import AnyEvent
+from vwkommi.request.filters import filter_responses
+from vwkommi.request.probe import ProbeStats
+from vwkommi.request.request_layer import RequestLayer
+from vwkommi.request.result import CarResult
+from vwkommi.request.schedule import AscendingSchedule, DenseSchedule
+from vwkommi.request.token_pool import TokenPool
+from vwkommi.request.trace import NullTracer, Tracer
+from vwkommi.settings import CACHE_SIZE, CACHE_TTL, Settings
 
 
 class DataRequest:  # pylint: disable=too-few-public-methods
@@ -33,145 +46,310 @@ class DataRequest:  # pylint: disable=too-few-public-methods
 
     def __init__(self) -> None:
         self.settings = Settings()
-        self.auth = Auth()
-        if self.auth.get_token() == "":
+        self.tracer = NullTracer()
+        self.token_pool = TokenPool(self.settings.accounts)
+        if not self.token_pool.login():
             return
         self.headers = {
-            "Authorization": self.auth.get_token(),
             "User-Agent": "Chrome v22.2 Linux Ubuntu",
         }
         self.year = 2020
         self.num_404 = 0
-        self.commission_number_count = 0
+        self.aborted = False  # whether the last run stopped early because there was no token
         self.session = requests.session()
-        for kommi_item in self.settings.commission_number_range:
-            self.commission_number_count += (kommi_item[2] - kommi_item[1]) + 1
+        self.request_layer = RequestLayer(self.session, CACHE_SIZE, CACHE_TTL)
+        self.probe_lock = threading.Lock()
+        self.probe_hits = collections.Counter()
+        self.probe_stats = ProbeStats()
+        self.probe_executor = None
+        self.speculative_probes = 1
+        self.request_budget_limit = None
+        self.request_budget = None
+        self.dense_schedule = None
 
     def is_authenticated(self) -> bool:
         """Returns true if there is a authentication token."""
-        return self.auth.is_authenticated()
+        return self.token_pool.is_authenticated()
 
-    def do_requests(self) -> None:
+    def enable_speculative_probing(self, probes: int, request_budget: int = None) -> None:
+        """Requests up to _probes_ combinations of prefix and year of a commission number at once.
+
+        The most likely combinations are requested first and the outstanding requests are
+        cancelled as soon as one of them is decisive. This lowers the latency of cars with an
+        unusual combination at the cost of additional requests. _request_budget_ limits the
+        number of additional requests per run. Once it is used up the combinations are requested
+        one after another again.
+        """
+        self.speculative_probes = max(1, probes)
+        self.request_budget_limit = request_budget
+        self.probe_executor = ThreadPoolExecutor(
+            max_workers=self.settings.worker_count * self.speculative_probes
+        )
+
+    def enable_dense_scheduling(self, sample_step: int = 50, gap: int = 3) -> None:
+        """Requests the neighbourhood of known cars first.
+
+        The cars of the previous scan of a range are used as starting points, or every
+        _sample_step_th commission number if there is none. See _DenseSchedule_ for details.
+        """
+        self.dense_schedule = (sample_step, gap)
+
+    def __start_run(self) -> None:
+        """Resets the state of the previous run."""
+        self.num_404 = 0
+        self.aborted = False
+        self.probe_stats = ProbeStats()
+        self.request_budget = self.request_budget_limit
+
+    def do_requests(
+        self,
+        ranges: list = None,
+        cancel_event: threading.Event = None,
+        archive: bool = False,
+    ) -> List[str]:
         """Performs all requests and stores the results to the file system.
 
         There will be one file for each range. The files will be stores within the subdirectory
-        _raw_data_.
+        _raw_data_. If no _ranges_ are given the commission number range of the settings is used.
+        Setting the _cancel_event_ stops the requests without writing the current range. With
+        _archive_ set the unfiltered responses are appended to a gzipped NDJSON file for each
+        range, which can be reprocessed later on without any requests.
+
+        Returns the paths of all written files.
         """
+        if ranges is None:
+            ranges = self.settings.commission_number_range
         handled_kommis = 0
+        commission_number_count = 0
+        for kommi_item in ranges:
+            commission_number_count += (kommi_item[2] - kommi_item[1]) + 1
+        self.__start_run()
+        files = []
         time_str = datetime.now().strftime(
             "%Y-%m-%dT%H.%M.%S"
         )  # use the same time for all requests
 
+        def __progress() -> None:
+            nonlocal handled_kommis
+            handled_kommis += 1
+            print(
+                f"Progress: {((handled_kommis/commission_number_count)*100):.2f}%",
+                end="\r",
+            )
+
         # create output directory
         if not os.path.exists(os.path.join(self.settings.base_dir, "raw_data")):
             os.mkdir(os.path.join(self.settings.base_dir, "raw_data"))
-        for (
-            kommi_item
-        ) in self.settings.commission_number_range:  # loop over every range
-            with ThreadPoolExecutor(
-                max_workers=self.settings.worker_count
-            ) as executor:  # self.settings.worker_count threads
-                map_args = [
-                    [
-                        kommi_item[0],
-                        kommi_item[3] if len(kommi_item) >= 4 else 4,
-                        arg,
-                        self,
-                    ]
-                    for arg in range(kommi_item[1], kommi_item[2] + 1)
-                ]
-                data_dict = {}
-                futures = []
-                for args in map_args:
-                    futures.append(executor.submit(DataRequest.__requests_worker, args))
-                for future in as_completed(futures):
-                    result = future.result()
-                    handled_kommis += 1
-
-                    # check result for bool value
-                    if result is True:
-                        executor.shutdown(cancel_futures=True)
-                        break
-                    if result is False:
-                        print(
-                            (
-                                "Progress: "
-                                f"{((handled_kommis/self.commission_number_count)*100):.2f}"
-                            ),
-                            end="\r",
-                        )
-                        self.num_404 += 1
-                        if self.num_404 >= 500:
-                            print("Reached end of data!")
-                            break
-                        continue
-
-                    # data is valid
-                    # reset num_404 as soon as we have valid data
-                    self.num_404 = 0
-
-                    # get results from threads
-                    (
-                        year,
-                        kommi,
-                        data_response,
-                        details_response,
-                        production_response,
-                        image_response,
-                    ) = result
-
-                    # store latest successful year for next requests to lower 404 requests
-                    # this is not perfect due to the threads but better than nothing
-                    if year != DataRequest.YEAR:
-                        DataRequest.YEAR = year
-
-                    data_dict[kommi] = (
-                        "["
-                        + data_response
-                        + ","
-                        + details_response
-                        + ","
-                        + production_response
-                        + ","
-                        + image_response
-                        + "]"
-                    )
-                    print(
-                        (
-                            "Progress: "
-                            f"{((handled_kommis/self.commission_number_count)*100):.2f}%"
-                        ),
-                        end="\r",
-                    )
-                # set file name
-                filename = f"output_{kommi_item[0]}_{kommi_item[1]}-{kommi_item[2]}_{time_str}.json"
-                with open(
-                    os.path.join(self.settings.base_dir, "raw_data", filename),
-                    "w",
+        for kommi_item in ranges:  # loop over every range
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            data_dict = {}
+            archive_file = None
+            if archive is True:
+                archive_file = gzip.open(
+                    os.path.join(
+                        self.settings.base_dir,
+                        "raw_data",
+                        f"archive_{kommi_item[0]}_{kommi_item[1]}-{kommi_item[2]}_{time_str}"
+                        ".ndjson.gz",
+                    ),
+                    "at",
                     encoding="utf-8",
-                ) as file:
-                    file.write("{\n")  # first line
-
-                    first = True  # just to put all the commas correctly
-                    for kommi_key in sorted(data_dict):
-                        if first is False:
-                            file.write(",\n")
-                        first = False
-                        file.write('"' + kommi_key + '":' + data_dict[kommi_key])
+                )
+            try:
+                for result in self.__iter_range(
+                    kommi_item, cancel_event, None, archive, __progress
+                ):
+                    with self.tracer.span(
+                        "consume", commission_number=result.commission_number
+                    ):
+                        if archive_file is not None:
+                            archive_file.write(result.raw + "\n")
+                        data_dict[result.commission_number] = result.json()
+            finally:
+                if archive_file is not None:
+                    archive_file.close()
+            if cancel_event is not None and cancel_event.is_set():
+                print("Requests cancelled!")
+                break
+            # set file name
+            filename = f"output_{kommi_item[0]}_{kommi_item[1]}-{kommi_item[2]}_{time_str}.json"
+            path = os.path.join(self.settings.base_dir, "raw_data", filename)
+            files.append(path)
+            with self.tracer.span("write", file=filename):
+                write_output(path, data_dict)
+        print(self.probe_stats.summary())
+        return files
+
+    def iter_results(
+        self,
+        ranges: list = None,
+        cancel_event: threading.Event = None,
+        max_pending: int = None,
+        archive: bool = False,
+    ) -> Iterator[CarResult]:
+        """Performs all requests and yields the result of every car found.
+
+        The results are yielded in the order they are completed. At most _max_pending_ commission
+        numbers (default: twice the worker count) are requested or waiting to be consumed at a
+        time, so no more requests are made while the caller is busy. If no _ranges_ are given the
+        commission number range of the settings is used. With _archive_ set the results contain
+        the unfiltered responses as well.
+        """
+        if ranges is None:
+            ranges = self.settings.commission_number_range
+        self.__start_run()
+        for kommi_item in ranges:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield from self.__iter_range(kommi_item, cancel_event, max_pending, archive)
+
+    async def aiter_results(
+        self,
+        ranges: list = None,
+        cancel_event: threading.Event = None,
+        max_pending: int = None,
+        archive: bool = False,
+    ) -> AsyncIterator[CarResult]:
+        """Asynchronous counterpart of _iter_results_.
+
+        The requests are made by the worker threads, so the event loop is never blocked. If the
+        consuming task is cancelled or stops iterating, the outstanding requests are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        results = self.iter_results(ranges, AnyEvent(stop, cancel_event), max_pending, archive)
+        end = object()
+        next_result = None
+        try:
+            while True:
+                next_result = loop.run_in_executor(None, next, results, end)
+                # shielded so a cancellation does not leave the generator running unnoticed
+                result = await asyncio.shield(next_result)
+                next_result = None
+                if result is end:
+                    return
+                yield result
+        finally:
+            stop.set()
+            if next_result is not None:
+                # the generator can only be closed after the running step returned
+                await asyncio.wait([next_result])
+            await loop.run_in_executor(None, results.close)
+
+    def __iter_range(
+        self,
+        kommi_item: list,
+        cancel_event: threading.Event,
+        max_pending: int,
+        archive: bool,
+        progress: Callable[[], None] = None,
+    ) -> Iterator[CarResult]:
+        """Requests a single range and yields the result of every car found.
+
+        _progress_ is called for every handled commission number.
+        """
+        if max_pending is None:
+            max_pending = self.settings.worker_count * 2
+        number_length = kommi_item[3] if len(kommi_item) >= 4 else 4
+        schedule = self.__create_schedule(kommi_item)
+        with ThreadPoolExecutor(
+            max_workers=self.settings.worker_count
+        ) as executor:  # self.settings.worker_count threads
+            pending = {}
+            try:
+                while True:
+                    # keep the number of pending requests bounded
+                    for index in schedule.take(max_pending - len(pending)):
+                        args = [kommi_item[0], number_length, index, self, archive]
+                        future = executor.submit(
+                            DataRequest.__requests_worker, args + [self.tracer.now()]
+                        )
+                        pending[future] = index
+                    if not pending:
+                        return
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        if cancel_event is not None and cancel_event.is_set():
+                            return
+                        result = future.result()
+                        if progress is not None:
+                            progress()
+
+                        # check result for bool value
+                        if result is True:
+                            self.aborted = True
+                            return
+                        if result is False:
+                            counts_towards_end = schedule.counts_towards_end(index)
+                            schedule.report(index, False)
+                            if counts_towards_end is False:
+                                continue
+                            self.num_404 += 1
+                            if self.num_404 >= 500:
+                                print("Reached end of data!")
+                                return
+                            continue
+
+                        # data is valid
+                        # reset num_404 as soon as we have valid data
+                        self.num_404 = 0
+                        schedule.report(index, True)
+
+                        # store latest successful year for next requests to lower 404 requests
+                        # this is not perfect due to the threads but better than nothing
+                        if result.year != DataRequest.YEAR:
+                            DataRequest.YEAR = result.year
+                        yield result
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+    def __create_schedule(self, kommi_item: list) -> Union[AscendingSchedule, DenseSchedule]:
+        """Creates the schedule of a range.
+
+        The dense schedule is seeded with the cars of the latest output file of the same range.
+        """
+        if self.dense_schedule is None:
+            return AscendingSchedule(kommi_item[1], kommi_item[2])
+        seeds = []
+        directory = os.path.join(self.settings.base_dir, "raw_data")
+        prefix = f"output_{kommi_item[0]}_{kommi_item[1]}-{kommi_item[2]}_"
+        if os.path.isdir(directory):
+            outputs = sorted(
+                name
+                for name in os.listdir(directory)
+                if name.startswith(prefix) and name.endswith(".json")
+            )
+            if outputs:
+                seeds = [
+                    int(kommi[len(kommi_item[0]) :])
+                    for kommi in read_commission_numbers(os.path.join(directory, outputs[-1]))
+                ]
+        sample_step, gap = self.dense_schedule
+        return DenseSchedule(kommi_item[1], kommi_item[2], seeds, sample_step, gap)
 
-                    file.write("\n}\n")  # last line
+    def find_prefix(
+        self, commission_number: str, cancel_event: threading.Event = None
+    ) -> Union[bool, tuple]:
+        """Finds the prefix of a certain commission number.
 
-    def find_prefix(self, commission_number: str) -> Union[bool, tuple]:
-        """Finds the prefix of a certain commission number."""
+        Outstanding requests are dropped as soon as a prefix is found or _cancel_event_ is set.
+        """
         print("Start looking for car.")
-        map_args = [
-            [commission_number, arg, self.headers, self.session] for arg in range(1000)
-        ]
+        map_args = [[commission_number, arg, self] for arg in range(1000)]
         with ThreadPoolExecutor(max_workers=30) as executor:  # 30 threads
-            for result in executor.map(
-                DataRequest.__find_commission_number_worker, map_args
-            ):
+            futures = [
+                executor.submit(DataRequest.__find_commission_number_worker, args)
+                for args in map_args
+            ]
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    break
+                result = future.result()
                 if not isinstance(result, bool):
+                    executor.shutdown(cancel_futures=True)
                     return result
         return False
 
@@ -183,9 +361,8 @@ class DataRequest:  # pylint: disable=too-few-public-methods
             return False
         else:
             prefix, year = result
-            response = self.session.get(
-                f"{DataRequest.DATA_URL}{prefix}{year}{commission_number}",
-                headers=self.headers,
+            response = self.__data_request(
+                f"{DataRequest.DATA_URL}{prefix}{year}{commission_number}"
             )
             if response.status_code != 200:
                 return False
@@ -194,7 +371,9 @@ class DataRequest:  # pylint: disable=too-few-public-methods
                 print("Model name not within vehicle data")
                 return False
             model_name = response["modelName"]
-            headers = self.headers
+            # the car is added to the profile of the first account
+            headers = dict(self.headers)
+            headers["Authorization"] = self.token_pool.primary_token()
             headers["traceId"] = (
                 f"{secrets.token_hex(4)}-{secrets.token_hex(2)}-"
                 f"{secrets.token_hex(2)}-{secrets.token_hex(2)}-"
@@ -217,211 +396,274 @@ class DataRequest:  # pylint: disable=too-few-public-methods
             print(f"Added car: {model_name} (year: {year}, prefix: {prefix})")
             return True
 
-    def reset_login(self):
-        self.auth.reset_token()
-        self.headers = {"Authorization": self.auth.get_token()}
+    def enable_tracing(self) -> Tracer:
+        """Records timed spans of all following requests and returns the tracer."""
+        self.tracer = Tracer()
+        self.token_pool.tracer = self.tracer
+        return self.tracer
 
-    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
-    @staticmethod
-    def __requests_worker(args) -> Union[bool, tuple]:
-        """worker thread"""
+    def reset_login(self) -> bool:
+        """Logs in all accounts which have no token."""
+        return self.token_pool.login()
 
-        # inner function to handle actual request including relogin once
-        def __data_request(_url: str):
-            response = self.session.get(
-                _url,
-                headers=self.headers,
+    def __data_request(self, url: str) -> requests.Response:
+        """Performs a GET request and tries it once again with another token if needed.
+
+        The rejected token is refreshed in the background.
+        """
+        with self.tracer.span("http", url=url):
+            index, token = self.token_pool.get_token()
+            response = self.request_layer.get(
+                url,
+                headers={**self.headers, "Authorization": token},
             )
             # try request once again
             if response.status_code == 401 or response.status_code == 502:
-                self.reset_login()
+                self.token_pool.invalidate(index, token)
+                index, token = self.token_pool.get_token()
                 response = requests.get(
-                    _url,
-                    headers=self.headers,
+                    url,
+                    headers={**self.headers, "Authorization": token},
                 )
             return response
 
-        def __busy_wait() -> bool:
-            wait_count = 0
-            while not self.auth.is_authenticated():
-                time.sleep(1)
-                wait_count += 1
-                if wait_count == 9:
-                    return False
-            return True
+    @staticmethod
+    def __requests_worker(args) -> Union[bool, CarResult]:
+        """worker thread"""
+        kommi_pre, number_length, index, self, _, submitted = args
+        if self.tracer.enabled is False:
+            return DataRequest.__request_commission_number(args)
+        self.tracer.record("queue_wait", submitted, self.tracer.now())
+        with self.tracer.span(
+            "commission_number", commission_number=f"{kommi_pre}{index:0{number_length}d}"
+        ):
+            return DataRequest.__request_commission_number(args)
+
+    def __busy_wait(self) -> bool:
+        """Simply waits some time until the next login or gives up after 10s."""
+        with self.tracer.span("busy_wait"):
+            return self.token_pool.wait(9)
+
+    def __probe_candidates(self) -> List[tuple]:
+        """Returns all combinations of prefix and year beginning with the "most" likely.
+
+        The order of the prefix list is kept and the latest successful year is tried first. With
+        speculative probing enabled the combinations which were found more often come first.
+        """
+        year = DataRequest.YEAR
+        years = [year]
+        years.extend([_year for _year in DataRequest.TRY_YEARS if _year != year])
+        candidates = [(prefix, _year) for prefix in self.settings.prefix_list for _year in years]
+        if self.speculative_probes <= 1:
+            return candidates
+        with self.probe_lock:
+            hits = dict(self.probe_hits)
+        return sorted(candidates, key=lambda candidate: -hits.get(candidate, 0))
 
+    def __reserve_batch(self, remaining: int) -> int:
+        """Returns how many candidates may be requested at once within the request budget.
+
+        The additional requests are reserved until the probe is settled by _settle_budget_.
+        """
+        if self.speculative_probes <= 1 or remaining <= 1:
+            return 1
+        with self.probe_lock:
+            size = min(self.speculative_probes, remaining)
+            if self.request_budget is not None:
+                size = max(1, min(size, self.request_budget + 1))
+                self.request_budget -= size - 1
+            return size
+
+    def __settle_budget(self, reserved: int, speculative_count: int) -> None:
+        """Charges the requests sent in addition to sequential probing to the request budget.
+
+        Misses cost nothing extra, since sequential probing requests all combinations as well.
+        """
+        with self.probe_lock:
+            if self.request_budget is not None:
+                self.request_budget += reserved - speculative_count
+
+    def __probe(self, url_append: str) -> Union[bool, tuple]:
+        """Finds the prefix and year of a commission number.
+
+        Returns the prefix, year and response or _False_ if there is no car and _True_ if the
+        requests should be stopped.
+        """
+        candidates = self.__probe_candidates()
+        start = time.perf_counter()
+        requests_count = 0
+        speculative_count = 0
+        cancelled_count = 0
+        reserved = 0
+        outcome = None
+        position = 0
+        while outcome is None and position < len(candidates):
+            size = self.__reserve_batch(len(candidates) - position)
+            reserved += size - 1
+            batch = candidates[position : position + size]
+            position += size
+            if not self.__busy_wait():
+                outcome = True
+                break
+            outcome, sent, cancelled = self.__probe_batch(batch, url_append)
+            requests_count += sent
+            cancelled_count += cancelled
+        if outcome is None:
+            outcome = False
+        hit = not isinstance(outcome, bool)
+        if hit is True:
+            # sequential probing would have stopped at the combination found
+            speculative_count = max(0, requests_count - (candidates.index(outcome[:2]) + 1))
+            with self.probe_lock:
+                self.probe_hits[outcome[:2]] += 1
+        self.__settle_budget(reserved, speculative_count)
+        self.probe_stats.add(
+            requests_count,
+            time.perf_counter() - start,
+            hit,
+            speculative_count,
+            cancelled_count,
+        )
+        return outcome
+
+    def __probe_batch(self, batch: List[tuple], url_append: str) -> tuple:
+        """Requests a batch of candidates at once.
+
+        The outstanding requests are cancelled as soon as one of them is decisive. Returns the
+        outcome (see _probe_outcome_), the number of requests sent and the number of requests
+        cancelled before being sent.
+        """
+        if len(batch) == 1:
+            prefix, year = batch[0]
+            response = self.__data_request(f"{DataRequest.DATA_URL}{prefix}{year}{url_append}")
+            return DataRequest.__probe_outcome(prefix, year, response), 1, 0
+        futures = {
+            self.probe_executor.submit(
+                self.__data_request, f"{DataRequest.DATA_URL}{prefix}{year}{url_append}"
+            ): (prefix, year)
+            for prefix, year in batch
+        }
+        outcome = None
+        for future in as_completed(futures):
+            prefix, year = futures[future]
+            outcome = DataRequest.__probe_outcome(prefix, year, future.result())
+            if outcome is not None:
+                break
+        cancelled = sum(1 for future in futures if future.cancel())
+        return outcome, len(futures) - cancelled, cancelled
+
+    @staticmethod
+    def __probe_outcome(prefix: int, year: int, response) -> Union[None, bool, tuple]:
+        """Evaluates the response of a single combination of prefix and year.
+
+        Returns _None_ if the combination is wrong, the prefix, year and response if it is right
+        or whether the requests should be stopped on any other error.
+        """
+        if response.status_code == 404:
+            return None
+        if response.status_code == 200:
+            return prefix, year, response
+        return response.status_code == 401 or response.status_code == 502
+
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    @staticmethod
+    def __request_commission_number(args) -> Union[bool, CarResult]:
+        """Requests and filters all data of a single commission number."""
         # basic data for request
-        year = DataRequest.YEAR
-        kommi_pre, number_length, index, self = args  # args for the worker
-        prefix_list = self.settings.prefix_list  # possible prefixes
+        kommi_pre, number_length, index, self, archive, _ = args  # args for the worker
         shutdown = False  # variable to stop worker
         url_append = (
             f"{kommi_pre}{index:0{number_length}d}"  # commission number (e.g. AF1234)
         )
 
         # request general car data
-        # to store prefix for future requests with this worker once found by the following loop
-        response = None
-        prefix = 0
-        # build list with years to check beginning with the "most" likely
-        years = [year]
-        years.extend([_year for _year in DataRequest.TRY_YEARS if _year != year])
-        for _prefix in prefix_list:  # try all prefixes
-            success = False
-            for _year in years:
-                # simply wait some time until the next login or give up after 10s
-                if not __busy_wait():
-                    return True
-
-                response = __data_request(
-                    f"{DataRequest.DATA_URL}{_prefix}{_year}{url_append}"
-                )
-                if response.status_code != 200:
-                    if response.status_code == 404:
-                        continue
-                    if response.status_code == 401 or response.status_code == 502:
-                        shutdown = True
-                    return shutdown
-                prefix = _prefix
-                year = _year
-                success = True
-                break
-            if success is True:
-                break
+        with self.tracer.span("probe"):
+            probe = self.__probe(url_append)
+        if isinstance(probe, bool):
+            return probe
+        prefix, year, response = probe
 
         # store data response
         data_response = response.json()
 
-        # get production data and line drawing if VIN or store some default values
-        production_status = [
-            {"codeText": "Produktionsstatus: keine FIN"},
-            {"codeText": "FIN verbunden: nein"},
-        ]
+        # get production data and line drawing if VIN
         production_json = None
-        image_status = {"codeText": "Bild: keine FIN"}
         image_json = None
         if self.settings.skip_fin_details is False and "vin" in data_response:
-            vin = data_response["vin"]  # store VIN
+            with self.tracer.span("vin"):
+                vin = data_response["vin"]  # store VIN
 
-            # simply wait some time until the next login or give up after 10s
-            if not __busy_wait():
-                return True
+                # simply wait some time until the next login or give up after 10s
+                if not self.__busy_wait():
+                    return True
 
-            # request production data
-            response = __data_request(f"{DataRequest.VIN_URL}{vin}/device-platform")
-            if response.status_code != 200:
-                if response.status_code == 401:
-                    shutdown = True
-                return shutdown
+                # request production data
+                response = self.__data_request(
+                    f"{DataRequest.VIN_URL}{vin}/device-platform"
+                )
+                if response.status_code != 200:
+                    if response.status_code == 401:
+                        shutdown = True
+                    return shutdown
+                production_json = response.json()
 
-            # set the data
-            production_json = response.json()
-            production_status = [
-                {"codeText": f'Produktionsstatus: {production_json["stage"]}'},
-                {"codeText": f'FIN verbunden: {production_json["connected"]}'},
-            ]
-            production_json = {
-                "stage": production_json["stage"],
-                "connected": production_json["connected"],
-            }
+                # simply wait some time until the next login or give up after 10s
+                if not self.__busy_wait():
+                    return True
+
+                # request line drawing
+                response = self.__data_request(f"{DataRequest.IMAGE_URL}{vin}")
+                if response.status_code != 200:
+                    if response.status_code == 401:
+                        shutdown = True
+                    return shutdown
+                image_json = response.json()
 
+        with self.tracer.span("details"):
             # simply wait some time until the next login or give up after 10s
-            if not __busy_wait():
+            if not self.__busy_wait():
                 return True
 
-            # request line drawing
-            response = __data_request(f"{DataRequest.IMAGE_URL}{vin}")
+            # request detailed car data
+            response = self.__data_request(
+                f"{DataRequest.DETAILS_URL}{prefix}{year}{url_append}"
+            )
             if response.status_code != 200:
                 if response.status_code == 401:
                     shutdown = True
                 return shutdown
-
-            # set the data
-            image_json = response.json()
-            has_images = len(image_json["imageUrls"]) > 1
-            image_status_str = "Strichzeichnung" if has_images is False else "Normal"
-            image_status = {"codeText": f"Bild: {image_status_str}"}
-            image_json = {"hasImages": has_images}
-
-        # simply wait some time until the next login or give up after 10s
-        if not __busy_wait():
-            return True
-
-        # request detailed car data
-        response = __data_request(
-            f"{DataRequest.DETAILS_URL}{prefix}{year}{url_append}"
-        )
-        if response.status_code != 200:
-            if response.status_code == 401:
-                shutdown = True
-            return shutdown
-        details_response = response.json()
-
-        # filter data
-        if (
-            not "specifications" in details_response
-        ):  # some commission numbers are without specs
-            details_response["specifications"] = []
-        model_name = data_response["modelName"] if "modelName" in data_response else ""
-        if model_name == "ID.3 Pro S":
-            model_name = "ID.3 Pro S (4-Sitzer)"
-        if model_name == "ID.3 Pro S (4-Sitzer)":
-            for spec in details_response["specifications"]:
-                if spec["codeText"][:11] == "3 Rücksitze":
-                    model_name = "ID.3 Pro S (5-Sitzer)"
-                    break
-        elif model_name == "ID.4":
-            model_name = "ID.4 GTX"
-        elif model_name == "ID.5":
-            model_name = "ID.5 GTX"
-        if "modelName" in data_response:
-            data_response["modelName"] = model_name
-
-        # apply some theories
-        pedal_spec = False
-        service_spec = False
-        for spec in details_response["specifications"]:
-            if service_spec is True:
-                if spec["codeText"].startswith("Umweltbonus"):
-                    details_response["specifications"].append(
-                        {"codeText": "eGolf-lu: A", "origin": ""}
-                    )
-                else:
-                    details_response["specifications"].append(
-                        {"codeText": "eGolf-lu: B", "origin": ""}
-                    )
-                break
-            if pedal_spec is True:
-                if spec["codeText"].startswith("Serviceanzeige"):
-                    service_spec = True
-                else:
-                    details_response["specifications"].append(
-                        {"codeText": "eGolf-lu: B", "origin": ""}
-                    )
-                    break
-            pedal_spec = spec["codeText"].startswith("Fußhebelwerk") or spec[
-                "codeText"
-            ].startswith("Pedale")
-        details_response["specifications"].extend(production_status)
-        details_response["specifications"].append(image_status)
+            details_response = response.json()
+
+        with self.tracer.span("json"):
+            # keep the unfiltered responses to be able to reprocess them later
+            raw_response = None
+            if archive is True:
+                raw_response = json.dumps(
+                    {
+                        "commissionNumber": url_append,
+                        "prefix": prefix,
+                        "year": year,
+                        "data": data_response,
+                        "details": details_response,
+                        "production": production_json,
+                        "image": image_json,
+                    },
+                    separators=(",", ":"),
+                    ensure_ascii=False,
+                )
+            filtered = filter_responses(
+                data_response, details_response, production_json, image_json
+            )
 
         # return everything including used year as we want to use that for all new requests
-        return (
-            year,
-            url_append,
-            json.dumps(data_response, separators=(",", ":"), ensure_ascii=False),
-            json.dumps(details_response, separators=(",", ":"), ensure_ascii=False),
-            json.dumps(production_json, separators=(",", ":"), ensure_ascii=False),
-            json.dumps(image_json, separators=(",", ":"), ensure_ascii=False),
-        )
+        return CarResult(url_append, prefix, year, *filtered, raw_response)
 
     @staticmethod
     def __find_commission_number_worker(args) -> Union[bool, tuple]:
-        commission_number, prefix, headers, session = args
+        commission_number, prefix, self = args
         for _year in DataRequest.TRY_YEARS:
-            response = session.get(
-                f"{DataRequest.DATA_URL}{prefix}{_year}{commission_number}",
-                headers=headers,
+            response = self.__data_request(
+                f"{DataRequest.DATA_URL}{prefix}{_year}{commission_number}"
             )
             if response.status_code == 200:
                 return (prefix, _year)
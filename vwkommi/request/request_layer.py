@@ -0,0 +1,85 @@
+"""Module performing the GET requests of _DataRequest_"""
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict
+import threading
+import time
+import requests
+
+
+class RequestLayer:
+    """Class sharing GET requests between all threads.
+
+    Concurrent requests of the same URL are coalesced into a single request and successful
+    responses are kept for _ttl_ seconds. At most _max_size_ responses are kept, the least
+    recently used ones are dropped first. The headers are not part of the key, as the responses
+    of the data URLs do not depend on the account. Only successful responses are shared though,
+    since any other one (e.g. a rejected token) may be caused by the headers of the caller.
+    """
+
+    def __init__(self, session: requests.Session, max_size: int, ttl: float) -> None:
+        self.session = session
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.in_flight: Dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, url: str, headers: Dict) -> requests.Response:
+        """Performs a GET request unless the response is known or already requested."""
+        with self.lock:
+            entry = self.cache.get(url)
+            if entry is not None:
+                expires, response = entry
+                if expires > time.monotonic():
+                    self.cache.move_to_end(url)
+                    self.hits += 1
+                    return response
+                del self.cache[url]
+            future = self.in_flight.get(url)
+            owner = future is None
+            if owner is True:
+                future = Future()
+                self.in_flight[url] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if owner is False:
+            try:
+                response = future.result()
+                if response.status_code == 200:
+                    return response
+            except Exception:  # pylint: disable=broad-except
+                pass
+            # the request failed for the headers of another caller, so send it with own ones
+            return self.session.get(url, headers=headers)
+
+        try:
+            response = self.session.get(url, headers=headers)
+        except BaseException as exception:
+            with self.lock:
+                del self.in_flight[url]
+            future.set_exception(exception)
+            raise
+        with self.lock:
+            del self.in_flight[url]
+            if response.status_code == 200 and self.max_size > 0:
+                self.cache[url] = (time.monotonic() + self.ttl, response)
+                self.cache.move_to_end(url)
+                while len(self.cache) > self.max_size:
+                    self.cache.popitem(last=False)
+        future.set_result(response)
+        return response
+
+    def stats(self) -> Dict:
+        """Returns the counters of the cache."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self.cache),
+            }
@@ -0,0 +1,29 @@
+"""Module containing the result of a single car"""
+from typing import NamedTuple, Optional
+import json
+
+
+class CarResult(NamedTuple):
+    """Filtered data of a single car.
+
+    The data is kept as compact JSON strings as it is written to the output files like that.
+    """
+
+    commission_number: str
+    prefix: int
+    year: int
+    data: str
+    details: str
+    production: str
+    image: str
+    raw: Optional[str] = None  # unfiltered responses, only set if requested
+
+    def json(self) -> str:
+        """Returns the JSON list stored for the car within the output files."""
+        return (
+            "[" + self.data + "," + self.details + "," + self.production + "," + self.image + "]"
+        )
+
+    def load(self) -> list:
+        """Returns the parsed vehicle data, details, production data and image data."""
+        return json.loads(self.json())
@@ -0,0 +1,92 @@
+"""Module deciding in which order the commission numbers of a range are requested"""
+from typing import Iterable, List
+import collections
+
+
+class AscendingSchedule:
+    """Requests the commission numbers in ascending order."""
+
+    def __init__(self, start: int, end: int) -> None:
+        self.numbers = iter(range(start, end + 1))
+
+    def take(self, count: int) -> List[int]:
+        """Returns up to _count_ commission numbers to be requested next."""
+        return [number for _, number in zip(range(count), self.numbers)]
+
+    def report(self, number: int, hit: bool) -> None:
+        """Reports whether there is a car for a commission number."""
+
+    def counts_towards_end(self, _number: int) -> bool:
+        """Returns whether a missing car counts towards detecting the end of the data."""
+        return True
+
+
+class DenseSchedule:
+    """Requests the neighbourhood of known cars first.
+
+    Cars are found in contiguous blocks. So the schedule starts at the _seeds_ (e.g. the cars of
+    the previous scan) and expands from every car found to its neighbours. The expansion stops
+    after _gap_ commission numbers in a row without a car. Without seeds every _sample_step_th
+    commission number is used instead. All other commission numbers are requested in ascending
+    order afterwards, or whenever there is nothing to expand at the moment.
+
+    Only missing cars of that background sweep beyond the last car found count towards detecting
+    the end of the data, so it is not detected within a gap between two blocks.
+    """
+
+    def __init__(
+        self, start: int, end: int, seeds: Iterable[int], sample_step: int = 50, gap: int = 3
+    ) -> None:
+        self.start = start
+        self.end = end
+        self.gap = gap
+        self.scheduled = set()
+        self.frontier = collections.deque()
+        self.directions = {}
+        self.highest_hit = start - 1
+        self.sweep = iter(range(start, end + 1))
+        seeds = sorted({seed for seed in seeds if start <= seed <= end})
+        if not seeds:
+            seeds = range(start, end + 1, max(1, sample_step))
+        for seed in seeds:
+            self.__add(seed, 0, 0)
+
+    def take(self, count: int) -> List[int]:
+        """Returns up to _count_ commission numbers to be requested next."""
+        numbers = []
+        while self.frontier and len(numbers) < count:
+            numbers.append(self.frontier.popleft())
+        while len(numbers) < count:
+            number = next(self.sweep, None)
+            if number is None:
+                break
+            if number not in self.scheduled:
+                self.scheduled.add(number)
+                numbers.append(number)
+        return numbers
+
+    def report(self, number: int, hit: bool) -> None:
+        """Reports whether there is a car for a commission number and expands from it."""
+        direction, misses = self.directions.pop(number, (None, 0))
+        if hit is True:
+            self.highest_hit = max(self.highest_hit, number)
+            # cars found by the background sweep are expanded like seeds
+            direction = 0 if direction is None else direction
+            misses = 0
+        else:
+            misses += 1
+        if direction is None or misses > self.gap:
+            return
+        for step in [-1, 1] if direction == 0 else [direction]:
+            self.__add(number + step, step, misses)
+
+    def counts_towards_end(self, number: int) -> bool:
+        """Returns whether a missing car counts towards detecting the end of the data."""
+        return number > self.highest_hit and number not in self.directions
+
+    def __add(self, number: int, direction: int, misses: int) -> None:
+        if number < self.start or number > self.end or number in self.scheduled:
+            return
+        self.scheduled.add(number)
+        self.directions[number] = (direction, misses)
+        self.frontier.append(number)
@@ -0,0 +1,147 @@
+"""Module spreading requests across the tokens of several accounts"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+import threading
+import time
+from vwkommi.request.auth import Auth
+from vwkommi.request.trace import NullTracer
+
+
+class TokenPool:
+    """Class handing out the tokens of several accounts in turn.
+
+    A token which is no longer valid is taken out of rotation and its account logs in again in
+    the background, so the requests continue with the other tokens in the meantime. If a login
+    fails it is retried with a growing delay (up to _MAX_RETRY_DELAY_ seconds) as soon as a token
+    is needed again.
+    """
+
+    MAX_RETRY_DELAY = 60
+
+    def __init__(self, accounts: List[Tuple[str, str]]) -> None:
+        self.auths = [Auth(username, password) for username, password in accounts]
+        self.refreshing = set()
+        self.failures = [0] * len(self.auths)
+        self.retry_after = [0.0] * len(self.auths)
+        self.next_index = 0
+        self.condition = threading.Condition()
+        self.tracer = NullTracer()
+
+    def login(self) -> bool:
+        """Logs in all accounts without a token in parallel.
+
+        Returns true if at least one token is available.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.auths)) as executor:
+            list(executor.map(lambda auth: auth.get_token(), self.auths))
+        with self.condition:
+            self.condition.notify_all()
+        return self.is_authenticated()
+
+    def is_authenticated(self) -> bool:
+        """Checks if there is a token in rotation."""
+        with self.condition:
+            return self.__ready_count() > 0
+
+    def get_token(self, timeout: float = 10) -> Tuple[int, str]:
+        """Returns the index of the account and its token.
+
+        Waits up to _timeout_ seconds if all tokens are refreshing. An empty token is returned
+        if there is none.
+        """
+        with self.condition:
+            if not self.__wait_ready(timeout):
+                return -1, ""
+            while True:
+                index = self.next_index
+                self.next_index = (self.next_index + 1) % len(self.auths)
+                if self.__is_ready(index):
+                    return index, self.auths[index].token
+
+    def primary_token(self, timeout: float = 10) -> str:
+        """Returns the token of the first account, e.g. for requests regarding its profile.
+
+        Waits up to _timeout_ seconds if the account is refreshing its token. An account without
+        a token logs in again first. An empty token is returned if there is none.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: 0 not in self.refreshing, timeout):
+                return ""
+            if self.auths[0].is_authenticated():
+                return self.auths[0].token
+            self.refreshing.add(0)
+        self.__relogin(0)
+        return self.auths[0].token
+
+    def wait(self, timeout: float) -> bool:
+        """Waits up to _timeout_ seconds until there is a token in rotation."""
+        with self.condition:
+            return self.__wait_ready(timeout)
+
+    def invalidate(self, index: int, token: str) -> None:
+        """Takes the token out of rotation and logs in its account again in the background.
+
+        Nothing happens if the token has already been replaced.
+        """
+        if index < 0:
+            return
+        with self.condition:
+            auth = self.auths[index]
+            if index in self.refreshing or auth.token != token:
+                return
+            self.refreshing.add(index)
+        # the token is out of rotation already, resetting it may access the token cache
+        auth.reset_token()
+        threading.Thread(target=self.__relogin, args=(index,), daemon=True).start()
+
+    def __relogin(self, index: int) -> None:
+        with self.tracer.span("relogin", account=index):
+            self.auths[index].get_token()
+        with self.condition:
+            self.refreshing.discard(index)
+            if self.auths[index].is_authenticated():
+                self.failures[index] = 0
+            else:
+                self.failures[index] += 1
+                self.retry_after[index] = time.monotonic() + min(
+                    2 ** self.failures[index], TokenPool.MAX_RETRY_DELAY
+                )
+            self.condition.notify_all()
+
+    def __wait_ready(self, timeout: float) -> bool:
+        """Waits up to _timeout_ seconds until there is a token in rotation.
+
+        Accounts without a token log in again in the meantime. Must be called with the condition
+        acquired.
+        """
+        deadline = time.monotonic() + timeout
+        while self.__ready_count() == 0:
+            self.__start_missing_logins()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # wake up regularly to retry failed logins
+            self.condition.wait(min(remaining, 1))
+        return True
+
+    def __start_missing_logins(self) -> None:
+        """Logs in all accounts without a token in the background once their retry delay passed.
+
+        Must be called with the condition acquired.
+        """
+        now = time.monotonic()
+        for index, auth in enumerate(self.auths):
+            if (
+                index in self.refreshing
+                or auth.is_authenticated()
+                or self.retry_after[index] > now
+            ):
+                continue
+            self.refreshing.add(index)
+            threading.Thread(target=self.__relogin, args=(index,), daemon=True).start()
+
+    def __is_ready(self, index: int) -> bool:
+        return index not in self.refreshing and self.auths[index].is_authenticated()
+
+    def __ready_count(self) -> int:
+        return sum(1 for index in range(len(self.auths)) if self.__is_ready(index))
@@ -0,0 +1,113 @@
+"""Module recording timed spans of the requests
+
+The spans are exported in the Chrome trace event format, so they can be viewed as a timeline
+(e.g. with chrome://tracing or https://ui.perfetto.dev).
+"""
+from typing import Dict
+import json
+import os
+import threading
+import time
+
+
+class Span:  # pylint: disable=too-few-public-methods
+    """A timed span which is recorded when its context is left."""
+
+    __slots__ = ["tracer", "name", "args", "start"]
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.record(self.name, self.start, time.perf_counter(), self.args)
+
+
+class NullSpan:  # pylint: disable=too-few-public-methods
+    """A span doing nothing."""
+
+    __slots__ = []
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class NullTracer:
+    """Tracer used if tracing is off. It records nothing."""
+
+    enabled = False
+    NULL_SPAN = NullSpan()
+
+    def span(self, _name: str, **_args) -> NullSpan:
+        """Returns a span doing nothing."""
+        return NullTracer.NULL_SPAN
+
+    def record(self, name: str, start: float, end: float, args: Dict = None) -> None:
+        """Records nothing."""
+
+    @staticmethod
+    def now() -> float:
+        """Returns no time as nothing is recorded anyway."""
+        return 0.0
+
+
+class Tracer:
+    """Tracer recording the spans of all threads."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.events = []
+        self.thread_names = {}
+        self.start = time.perf_counter()
+        self.pid = os.getpid()
+
+    def span(self, name: str, **args) -> Span:
+        """Returns a span recording the time spent within its context."""
+        return Span(self, name, args)
+
+    def record(self, name: str, start: float, end: float, args: Dict = None) -> None:
+        """Records a span from _start_ to _end_ (values of _time.perf_counter_)."""
+        thread = threading.current_thread()
+        self.thread_names[thread.ident] = thread.name
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.start) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self.pid,
+                "tid": thread.ident,
+                "args": args or {},
+            }
+        )
+
+    @staticmethod
+    def now() -> float:
+        """Returns the current time to be used with _record_."""
+        return time.perf_counter()
+
+    def export(self, path: str) -> None:
+        """Writes all spans recorded so far to a Chrome trace event JSON file."""
+        events = list(self.events)
+        for tid, thread_name in list(self.thread_names.items()):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
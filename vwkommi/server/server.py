@@ -0,0 +1,260 @@
+"""Module providing a long-running daemon with a local job API"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Union
+import itertools
+import json
+import queue
+import threading
+import time
+from vwkommi.request.request import DataRequest
+
+
+class Job:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """A single job handled by the daemon."""
+
+    TYPES = ["scan", "find_prefix", "add_to_profile"]
+
+    def __init__(self, job_id: int, job_type: str, params: Dict) -> None:
+        self.job_id = job_id
+        self.job_type = job_type
+        self.params = params
+        self.status = "queued"
+        self.result = None
+        self.error = ""
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+
+    def to_dict(self) -> Dict:
+        """Returns the job as JSON serializable dict."""
+        return {
+            "id": self.job_id,
+            "type": self.job_type,
+            "params": self.params,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobManager:
+    """Queues jobs and runs them on one shared _DataRequest_.
+
+    Scans run on their own lane so lookups do not have to wait for a scan to finish.
+    """
+
+    MAX_FINISHED_JOBS = 100
+
+    def __init__(self, data_request: DataRequest) -> None:
+        self.data_request = data_request
+        self.jobs: Dict[int, Job] = {}
+        self.lock = threading.Lock()
+        self.job_ids = itertools.count(1)
+        self.queues = {"scan": queue.Queue(), "lookup": queue.Queue()}
+        for lane, job_queue in self.queues.items():
+            threading.Thread(
+                target=self.__run_lane,
+                args=(job_queue,),
+                name=f"vwkommi-{lane}",
+                daemon=True,
+            ).start()
+
+    def submit(self, job_type: str, params: Dict) -> Union[Job, str]:
+        """Adds a job to the queue.
+
+        Returns the job or an error message if the job is invalid.
+        """
+        error = JobManager.__validate(job_type, params)
+        if error:
+            return error
+        with self.lock:
+            job = Job(next(self.job_ids), job_type, params)
+            self.jobs[job.job_id] = job
+            self.__prune()
+        self.queues["scan" if job_type == "scan" else "lookup"].put(job)
+        return job
+
+    def get(self, job_id: int) -> Union[Job, None]:
+        """Returns the job with the given id."""
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        """Returns all known jobs."""
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: int) -> Union[Job, None]:
+        """Cancels a queued or running job."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished = time.time()
+            job.cancel_event.set()
+            return job
+
+    def __prune(self) -> None:
+        """Drops the oldest finished jobs. Expects the lock to be held."""
+        finished = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.status not in ["queued", "running"]
+        ]
+        for job_id in finished[: max(0, len(finished) - JobManager.MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def __run_lane(self, job_queue: queue.Queue) -> None:
+        while True:
+            job = job_queue.get()
+            with self.lock:
+                if job.status == "cancelled":
+                    continue
+                job.status = "running"
+                job.started = time.time()
+            try:
+                if not self.data_request.is_authenticated():
+                    self.data_request.reset_login()
+                result = self.__execute(job)
+                status = "cancelled" if job.cancel_event.is_set() else "done"
+                error = ""
+            except Exception as exception:  # pylint: disable=broad-except
+                result = None
+                status = "failed"
+                error = str(exception)
+            with self.lock:
+                job.result = result
+                job.status = status
+                job.error = error
+                job.finished = time.time()
+
+    def __execute(self, job: Job):
+        if job.job_type == "scan":
+            return self.data_request.do_requests(
+                ranges=job.params.get("commission_number_range"),
+                cancel_event=job.cancel_event,
+            )
+        if job.job_type == "find_prefix":
+            result = self.data_request.find_prefix(
+                job.params["commission_number"], cancel_event=job.cancel_event
+            )
+            if isinstance(result, bool):
+                return None
+            prefix, year = result
+            return {"prefix": prefix, "year": year}
+        return self.data_request.add_to_profile(job.params["commission_number"])
+
+    @staticmethod
+    def __validate(job_type: str, params: Dict) -> str:
+        if job_type not in Job.TYPES:
+            return f"Unknown job type. Use one of: {', '.join(Job.TYPES)}"
+        if job_type != "scan":
+            if not isinstance(params.get("commission_number"), str):
+                return "commission_number must be a string."
+            return ""
+        commission_number_range = params.get("commission_number_range")
+        if commission_number_range is None:
+            return ""
+        if not isinstance(commission_number_range, list):
+            return "commission_number_range must be a list."
+        type_list = [str, int, int, int]
+        for _range in commission_number_range:
+            if not isinstance(_range, list) or len(_range) != 4:
+                return "Each commission number range must contain four elements."
+            for index, entry in enumerate(_range):
+                if not isinstance(entry, type_list[index]):
+                    return "Commission number ranges must look like [str, int, int, int]."
+        return ""
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Handles the local HTTP job API.
+
+    * POST /jobs - submits a job, e.g. {"type": "find_prefix", "commission_number": "AL1234"}
+    * GET /jobs - lists all jobs
+    * GET /jobs/<id> - returns the status of a job
+    * DELETE /jobs/<id> - cancels a job
+    * GET /stats - returns the counters of the response cache
+    """
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Returns one or all jobs."""
+        manager = self.server.manager
+        if self.path.rstrip("/") == "/stats":
+            self.__send(200, manager.data_request.request_layer.stats())
+            return
+        if self.path.rstrip("/") == "/jobs":
+            self.__send(200, [job.to_dict() for job in manager.list()])
+            return
+        job_id = self.__job_id()
+        job = manager.get(job_id) if job_id is not None else None
+        if job is None:
+            self.__send(404, {"error": "Job not found"})
+            return
+        self.__send(200, job.to_dict())
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Submits a new job."""
+        if self.path.rstrip("/") != "/jobs":
+            self.__send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.decoder.JSONDecodeError):
+            self.__send(400, {"error": "Body must be valid JSON"})
+            return
+        if not isinstance(params, dict):
+            self.__send(400, {"error": "Body must be a JSON object"})
+            return
+        job = self.server.manager.submit(params.pop("type", ""), params)
+        if isinstance(job, str):
+            self.__send(400, {"error": job})
+            return
+        self.__send(201, job.to_dict())
+
+    def do_DELETE(self) -> None:  # pylint: disable=invalid-name
+        """Cancels a job."""
+        job_id = self.__job_id()
+        job = self.server.manager.cancel(job_id) if job_id is not None else None
+        if job is None:
+            self.__send(404, {"error": "Job not found"})
+            return
+        self.__send(200, job.to_dict())
+
+    def __job_id(self) -> Union[int, None]:
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "jobs" or not parts[1].isdigit():
+            return None
+        return int(parts[1])
+
+    def __send(self, status: int, data) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host: str, port: int) -> bool:
+    """Logs in once and serves the job API until interrupted."""
+    data_request = DataRequest()
+    if data_request.is_authenticated() is False:
+        return False
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.manager = JobManager(data_request)
+    print(f"Serving job API on http://{host}:{port}/jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down.")
+    finally:
+        server.server_close()
+    return True
@@ -12,6 +12,9 @@ WORKER_COUNT = 30
 VW_USERNAME = "example_user"
 VW_PASSWORD = "example_password"
 
+# additional VW accounts as (username, password) tuples to spread the requests across
+VW_ACCOUNTS = []
+
 # known request prefixes
 PREFIX_LIST = [185, 900, 877, 902]  # known prefixes for ID.3/4/5
 
@@ -34,6 +37,28 @@ COMMISSION_NUMBER_RANGE = [
     ("AQ", 0, 9999, 4),
 ]
 
+# address of the job API of the serve command
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+
+# rescan intervals in seconds for the watch command (ranges which change often use the first ones)
+WATCH_INTERVALS = [900, 3600, 4 * 3600, 24 * 3600]
+
+# number of recent scans used to rate how often a range changes
+WATCH_HISTORY = 8
+
+# number of successful responses kept in memory to avoid requesting the same URL again
+CACHE_SIZE = 1024
+
+# seconds a response is kept in memory
+CACHE_TTL = 300
+
+# reuse the authentication token across runs (stored within the base directory)
+TOKEN_CACHE = False
+
+# seconds a cached authentication token is reused
+TOKEN_CACHE_TTL = 3000
+
 
 class Settings(object):
     def __new__(cls, *args, **kwds):
@@ -53,6 +78,7 @@ class Settings(object):
         prefix_list: list,
         skip_fin_details: bool,
         commission_number_range: list,
+        accounts: list = None,
     ):
         self.base_dir = base_dir
         self.worker_count = worker_count
@@ -61,6 +87,14 @@ class Settings(object):
         self.prefix_list = prefix_list
         self.skip_fin_details = skip_fin_details
         self.commission_number_range = commission_number_range
+        self.extra_accounts = accounts if accounts is not None else []
+
+    @property
+    def accounts(self) -> list:
+        """All accounts as (username, password) tuples, the one of _username_ first."""
+        return [(self.username, self.password)] + [
+            tuple(account) for account in self.extra_accounts
+        ]
 
     def update_settings(
         self,
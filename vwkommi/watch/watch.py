@@ -0,0 +1,150 @@
+"""Module rescanning commission number ranges depending on how often they change"""
+from datetime import datetime
+from typing import Dict, List
+import hashlib
+import json
+import os
+import time
+from vwkommi.request.request import DataRequest
+from vwkommi.settings import Settings, WATCH_HISTORY, WATCH_INTERVALS
+
+
+class Watch:
+    """Class rescanning every range in its own interval.
+
+    The interval of a range is one of the tiers in _WATCH_INTERVALS_. The more often per time the
+    data of a range changed within the last _WATCH_HISTORY_ scans the shorter is its interval. The state is
+    stored within _raw_data/watch_state.json_ so it survives restarts.
+    """
+
+    STATE_FILE = "watch_state.json"
+
+    def __init__(self, data_request: DataRequest) -> None:
+        self.data_request = data_request
+        self.settings = Settings()
+        self.state_path = os.path.join(
+            self.settings.base_dir, "raw_data", Watch.STATE_FILE
+        )
+        self.state = self.__load_state()
+
+    def run(self, once: bool = False) -> None:
+        """Scans all due ranges until interrupted.
+
+        With _once_ set only the ranges which are currently due are scanned.
+        """
+        while True:
+            for kommi_item in self.__due_ranges():
+                self.scan(kommi_item)
+            if once:
+                return
+            next_run = min(
+                self.__range_state(kommi_item)["next_run"]
+                for kommi_item in self.settings.commission_number_range
+            )
+            wait = next_run - time.time()
+            if wait > 0:
+                print(
+                    "Next scan at "
+                    f"{datetime.fromtimestamp(next_run).strftime('%Y-%m-%d %H:%M:%S')}"
+                )
+                time.sleep(wait)
+
+    def scan(self, kommi_item: list) -> None:
+        """Scans a single range and updates its interval."""
+        key = Watch.__key(kommi_item)
+        range_state = self.__range_state(kommi_item)
+        print(f"Scanning {key}")
+        files = self.data_request.do_requests(ranges=[kommi_item])
+        if not files:
+            return
+        if self.data_request.aborted is True:
+            # the snapshot is incomplete, so it is neither compared nor kept in the history
+            range_state["next_run"] = time.time() + WATCH_INTERVALS[0]
+            print(f"Scan of {key} was aborted, retrying in {WATCH_INTERVALS[0]}s")
+            self.__save_state()
+            return
+        digest = Watch.__digest(files[0])
+        # older states stored the changes without the time of the scan
+        history = [entry for entry in range_state["history"] if isinstance(entry, list)]
+        changed = bool(range_state["digest"]) and digest != range_state["digest"]
+        history.append([time.time(), changed])
+        range_state["history"] = history[-(WATCH_HISTORY + 1) :]
+        range_state["digest"] = digest
+        range_state["interval"] = Watch.interval(
+            range_state["history"], range_state["interval"]
+        )
+        range_state["next_run"] = time.time() + range_state["interval"]
+        changes = sum(changed for _, changed in range_state["history"][1:])
+        print(
+            f"{key} changed in {changes} of the last {len(range_state['history']) - 1} scans, "
+            f"next scan in {range_state['interval']}s"
+        )
+        self.__save_state()
+
+    @staticmethod
+    def interval(history: List[list], current: int) -> int:
+        """Returns the interval tier for a history of [scan time, changed] entries.
+
+        The tier is the longest one not exceeding the mean time between the changes since the
+        first scan of the history. Without changes one change is assumed, so quiet ranges move up
+        as time passes. If every scan saw a change, changes may have been missed and the next
+        shorter tier is tried. The tier moves at most one step away from _current_ per scan.
+        """
+        if len(history) < 2:
+            return WATCH_INTERVALS[0]
+        current_tier = WATCH_INTERVALS.index(current) if current in WATCH_INTERVALS else 0
+        changes = sum(changed for _, changed in history[1:])
+        if changes == len(history) - 1:
+            tier = current_tier - 1
+        else:
+            period = (history[-1][0] - history[0][0]) / max(changes, 1)
+            tier = max(
+                (tier for tier, interval in enumerate(WATCH_INTERVALS) if interval <= period),
+                default=0,
+            )
+        tier = min(max(tier, current_tier - 1, 0), current_tier + 1)
+        return WATCH_INTERVALS[tier]
+
+    def __due_ranges(self) -> List[list]:
+        now = time.time()
+        due = [
+            kommi_item
+            for kommi_item in self.settings.commission_number_range
+            if self.__range_state(kommi_item)["next_run"] <= now
+        ]
+        # most overdue ranges first
+        return sorted(due, key=lambda item: self.__range_state(item)["next_run"])
+
+    def __range_state(self, kommi_item: list) -> Dict:
+        return self.state.setdefault(
+            Watch.__key(kommi_item),
+            {"digest": "", "history": [], "interval": WATCH_INTERVALS[0], "next_run": 0},
+        )
+
+    def __load_state(self) -> Dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            print("Watch state could not be read. Starting over.")
+            return {}
+
+    def __save_state(self) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def __key(kommi_item: list) -> str:
+        return f"{kommi_item[0]}_{kommi_item[1]}-{kommi_item[2]}"
+
+    @staticmethod
+    def __digest(path: str) -> str:
+        sha = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha.update(chunk)
+        return sha.hexdigest()